@@ -0,0 +1,130 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Resolved once as a str: spec_from_file_location takes it as-is, and the
+# location stays correct even if a fixture chdirs into a tmp dir first.
+SCRIPT_PATH = str(Path(__file__).resolve().parents[1] / "payroll_fill.py")
+
+def _load_module():
+    # Execute payroll_fill.py once for the whole session; re-exec'ing it per
+    # test file re-imports pandas and redoes all module-level setup.
+    if "payroll_fill" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("payroll_fill", SCRIPT_PATH)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)  # type: ignore
+        sys.modules["payroll_fill"] = mod
+    return sys.modules["payroll_fill"]
+
+# Import at collection time so plain `import payroll_fill` works in any test.
+_load_module()
+
+@pytest.fixture(scope="session")
+def payroll_mod():
+    return _load_module()
+
+ROSTER_COLS = [
+    "SSN","First Name","MI","Last Name","Address 1","Address 2","City","State","Zip",
+    "Date of Birth","Date of Hire","Date of Term","Rehire Date","Email Address","Profit Share"
+]
+
+@pytest.fixture(scope="session")
+def roster_csv(tmp_path_factory):
+    """Shared read-only roster asset, written once per session.
+
+    Jane A Doe, John Smith and Emily R Johnson all have pay rows in the
+    incoming asset; Zoe Nope has none and lands in the unmatched report.
+    """
+    p = tmp_path_factory.mktemp("assets") / "roster.csv"
+    df = pd.DataFrame([
+        ["111-22-3333","Jane","A","Doe","100 Main St","","Springfield","IL","62701",
+         "1990-01-02","2020-03-04","","","jane@example.com",""],
+        ["222-33-4444","John","","Smith","200 Oak Ave","Apt 2","Shelbyville","IL","62565",
+         "1988-05-06","2019-07-08","","","john@example.com",""],
+        ["333-44-5555","Emily","R","Johnson","300 Pine Rd","","Capital City","IL","62702",
+         "1991-03-04","2022-05-06","","","emily@example.com",""],
+        ["444-55-6666","Zoe","","Nope","999 Nowhere","","Capital City","IL","62799",
+         "1992-09-10","2021-01-01","","","zoe@example.com",""],
+    ], columns=ROSTER_COLS)
+    # 64 KiB buffer: the whole file goes to the kernel in one write
+    with open(p, "w", buffering=1 << 16, encoding="utf-8", newline="") as f:
+        df.to_csv(f, index=False, lineterminator="\n")
+    return p
+
+@pytest.fixture(scope="session")
+def incoming_csv(tmp_path_factory):
+    """Shared read-only incoming payroll asset: three pay rows, two dates."""
+    p = tmp_path_factory.mktemp("assets") / "incoming.csv"
+    df = pd.DataFrame([
+        ["2025-09-05","2025-09-05","08/25/2025 - 09/05/2025","Payroll","1001","Springfield HQ",
+         "Doe","Jane A","80","0","0","2400.00","150.00","75.00","50.00"],
+        ["2025-09-05","2025-09-05","08/25/2025 - 09/05/2025","Payroll","1002","Shelbyville Office",
+         "Smith","John","85","5","0","2850.00","200.00","100.00","60.00"],
+        ["2025-09-12","2025-09-12","09/08/2025 - 09/12/2025","Payroll","1003","Capital City Plant",
+         "Johnson","Emily R","75","0","10","2250.00","175.00","50.00","40.00"],
+    ], columns=[
+        "Pay Date","Transaction Date","Pay Period","Source","Paycheck #","Location Name",
+        "Employee Last Name","Employee First Name",
+        "Regular Hours","Overtime Hours","Vacation/PTO Hours",
+        "Gross Pay","401k","Roth 401K","401K Match 2"
+    ])
+    # 64 KiB buffer: the whole file goes to the kernel in one write
+    with open(p, "w", buffering=1 << 16, encoding="utf-8", newline="") as f:
+        df.to_csv(f, index=False, lineterminator="\n")
+    return p
+
+@pytest.fixture(scope="session")
+def pipeline_env(tmp_path_factory, roster_csv):
+    """Fresh run dir plus ROSTER_PATH/cache env and auto-confirmed input().
+
+    The patch answers every prompt with "" ("yes" / press enter), however
+    many times main() asks; an iterator here would raise StopIteration if
+    a new prompt were ever added.
+    """
+    root = tmp_path_factory.mktemp("pipeline")
+    mp = pytest.MonkeyPatch()
+    mp.setenv("ROSTER_PATH", str(roster_csv))
+    # Sandbox the content-hash cache: the e2e fixtures are byte-identical
+    # every session, so a warm ~/.cache would let main() skip the whole
+    # matching pipeline and hide regressions from the suite.
+    mp.setenv("PAYROLL_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    mp.setattr("builtins.input", lambda *args, **kwargs: "")
+    yield root
+    mp.undo()
+
+@pytest.fixture(scope="session")
+def pipeline_run(pipeline_env, incoming_csv):
+    """Run main() once on the shared assets; e2e tests read the artifacts.
+
+    dist/ ends up with a two-row 2025-09-05 file, a one-row 2025-09-12
+    file, and an unmatched report listing Zoe Nope.
+    """
+    mod = _load_module()
+    root = pipeline_env
+    # Symlink rather than copy; main() only reads and archives the input.
+    incoming = root / "incoming.csv"
+    os.symlink(incoming_csv, incoming)
+
+    # chdir only for the duration of the run: a session-scoped chdir would
+    # leak into every test collected after the first e2e one and break any
+    # CWD-relative fixture paths.
+    run_mp = pytest.MonkeyPatch()
+    run_mp.chdir(root)
+    old_argv = sys.argv
+    sys.argv = ["payroll_fill.py", str(incoming)]
+    try:
+        mod.main()
+    finally:
+        sys.argv = old_argv
+        run_mp.undo()
+
+    yield {
+        "mod": mod,
+        "root": root,
+        "dist": root / "dist",
+        "archive": root / "data" / "archive",
+    }
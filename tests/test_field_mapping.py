@@ -1,32 +1,26 @@
-from pathlib import Path
-import importlib.util
 import pandas as pd
 
-SCRIPT = Path("payroll_fill.py")
-spec = importlib.util.spec_from_file_location("payroll_fill", SCRIPT)
-mod = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(mod)  # type: ignore
+import payroll_fill as mod  # loaded once by tests/conftest.py
 
-def _tmpl(rows):
-    return pd.DataFrame(rows, columns=[mod.T_FIRST, mod.T_MI, mod.T_LAST])
+# Scenario frames, built once; matching and mapping never mutate inputs.
+DF_T = pd.DataFrame([
+    ["Jane", "A", "Doe"],
+    ["John", "", "Smith"],
+], columns=[mod.T_FIRST, mod.T_MI, mod.T_LAST])
 
-def test_field_mapping_and_hours_sum():
-    df_t = _tmpl([
-        ["Jane", "A", "Doe"],
-        ["John", "", "Smith"],
-    ])
-    # Raw CSV representation: headers must match canonical (post-alias) names
-    df_c = pd.DataFrame([
-        # Employee Last, Employee First, Reg, OT, PTO, Gross, 401k, Roth, Match
-        ["Doe",   "Jane A", "80", "0", "0",    "2,400.00", "$150", "75", "50"],
-        ["Smith", "John",   "85", "5", "",     "$2,850",   "200",  "100","60"],
-    ], columns=[
-        mod.C_LAST, mod.C_FIRST,
-        mod.RAW_HRS_REG, mod.RAW_HRS_OT, mod.RAW_HRS_PTO,
-        mod.RAW_GROSS_PAY, mod.RAW_PRETAX, mod.RAW_ROTH, mod.RAW_SAFE_HARBOR_NE
-    ])
+# Raw CSV representation: headers must match canonical (post-alias) names
+DF_C = pd.DataFrame([
+    # Employee Last, Employee First, Reg, OT, PTO, Gross, 401k, Roth, Match
+    ["Doe",   "Jane A", "80", "0", "0",    "2,400.00", "$150", "75", "50"],
+    ["Smith", "John",   "85", "5", "",     "$2,850",   "200",  "100","60"],
+], columns=[
+    mod.C_LAST, mod.C_FIRST,
+    mod.RAW_HRS_REG, mod.RAW_HRS_OT, mod.RAW_HRS_PTO,
+    mod.RAW_GROSS_PAY, mod.RAW_PRETAX, mod.RAW_ROTH, mod.RAW_SAFE_HARBOR_NE
+])
 
-    matched = mod.match_template_to_csv(df_t, df_c)
+def test_field_mapping_and_hours_sum():
+    matched = mod.match_template_to_csv(DF_T, DF_C)
     filled  = mod.apply_field_mapping(matched)
 
     # Row 0 (Jane)
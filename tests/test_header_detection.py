@@ -1,24 +1,27 @@
-import sys
 from pathlib import Path
-import importlib.util
 
-# Import detect_header_row from payroll_cli.py without changing your script
-SCRIPT = Path("payroll_fill.py")
-spec = importlib.util.spec_from_file_location("payroll_fill", SCRIPT)
-mod = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(mod)  # type: ignore
+import pytest
 
-def test_header0():
-    p = Path("data/incoming/header0.csv")
-    idx = mod.detect_header_row(p, mod.EXPECT_NAMES)
-    assert idx == 0
+# Repo-absolute so the tests don't depend on the collection CWD
+DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "incoming"
 
-def test_header11():
-    p = Path("data/incoming/header11.csv")
-    idx = mod.detect_header_row(p, mod.EXPECT_NAMES)
-    assert idx == 11
+@pytest.mark.parametrize("fname,expected", [
+    ("header0.csv", 0),
+    ("header11.csv", 11),
+    ("header20.csv", 20),
+])
+def test_header_row_detection(payroll_mod, fname, expected):
+    p = DATA_DIR / fname
+    idx = payroll_mod.detect_header_row(p, payroll_mod.EXPECT_NAMES)
+    assert idx == expected
 
-def test_header20():
-    p = Path("data/incoming/header20.csv")
-    idx = mod.detect_header_row(p, mod.EXPECT_NAMES)
-    assert idx == 20
+def test_read_payroll_csv_skips_preamble(payroll_mod):
+    # Regression: the pyarrow engine infers columns from the first physical
+    # line, so a file with preamble rows above the header must still parse.
+    p = DATA_DIR / "header11.csv"
+    hdr_idx, delim = payroll_mod.detect_header(p, payroll_mod.EXPECT_NAMES)
+    df = payroll_mod._read_payroll_csv(p, hdr_idx, delim,
+                                       usecols=["Employee Last Name", "Pay Date"])
+    assert list(df.columns) == ["Pay Date", "Employee Last Name"]
+    assert len(df) == 4
+    assert (df["Pay Date"] == "2025-09-05").all()
@@ -1,12 +1,7 @@
-from pathlib import Path
-import importlib.util
 import pandas as pd
+import pytest
 
-# Import from payroll_fill.py
-SCRIPT = Path("payroll_fill.py")
-spec = importlib.util.spec_from_file_location("payroll_fill", SCRIPT)
-mod = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(mod)  # type: ignore
+import payroll_fill as mod  # loaded once by tests/conftest.py
 
 def _tmpl(rows):
     return pd.DataFrame(rows, columns=[mod.T_FIRST, mod.T_MI, mod.T_LAST])
@@ -14,55 +9,62 @@ def _tmpl(rows):
 def _raw(rows):
     return pd.DataFrame(rows, columns=[mod.C_LAST, mod.C_FIRST])
 
+# Scenario frames, built once; matching never mutates its inputs.
+DF_T_JANE      = _tmpl([["Jane", "A", "Doe"]])
+DF_C_JANE      = _raw([["Doe", "Jane A"]])
+DF_T_JOHN      = _tmpl([["John", "", "Smith"]])
+DF_C_JOHN      = _raw([["Smith", "John"]])
+DF_T_MARY_ANN  = _tmpl([["Mary Ann", "", "Brown"]])
+DF_C_MARY_ANN  = _raw([["Brown", "Mary Ann"]])
+DF_T_ALEX      = _tmpl([["Alex", "", "Doe"]])
+DF_C_ALEX_JR   = _raw([["Doe Jr", "Alex"]])
+DF_T_ZOE       = _tmpl([["Zoe", "", "Nope"]])
+DF_C_SOMEONE   = _raw([["Someone", "Else"]])
+
 def test_strict_match_with_mi():
-    df_t = _tmpl([
-        ["Jane", "A", "Doe"],
-    ])
-    df_c = _raw([
-        ["Doe", "Jane A"],
-    ])
-    m = mod.match_template_to_csv(df_t, df_c)
+    m = mod.match_template_to_csv(DF_T_JANE, DF_C_JANE)
     assert (m["_MATCH_TYPE"] == "strict").iloc[0]
 
 def test_loose_match_no_mi():
-    df_t = _tmpl([
-        ["John", "", "Smith"],
-    ])
-    df_c = _raw([
-        ["Smith", "John"],
-    ])
-    m = mod.match_template_to_csv(df_t, df_c)
+    m = mod.match_template_to_csv(DF_T_JOHN, DF_C_JOHN)
     assert (m["_MATCH_TYPE"] == "loose").iloc[0]
 
 def test_compound_first_name():
     # CSV first name "Mary Ann" (no MI) should match template First="Mary Ann", MI=""
-    df_t = _tmpl([
-        ["Mary Ann", "", "Brown"],
-    ])
-    df_c = _raw([
-        ["Brown", "Mary Ann"],
-    ])
-    m = mod.match_template_to_csv(df_t, df_c)
+    m = mod.match_template_to_csv(DF_T_MARY_ANN, DF_C_MARY_ANN)
     assert (m["_MATCH_TYPE"] == "loose").iloc[0]
 
 def test_suffix_handling_jr():
     # Template has no suffix, CSV last name includes "Jr"
-    df_t = _tmpl([
-        ["Alex", "", "Doe"],
-    ])
-    df_c = _raw([
-        ["Doe Jr", "Alex"],
-    ])
-    m = mod.match_template_to_csv(df_t, df_c)
+    m = mod.match_template_to_csv(DF_T_ALEX, DF_C_ALEX_JR)
     # suffix removed → keys equal → loose match
     assert (m["_MATCH_TYPE"] != "unmatched").iloc[0]
 
 def test_unmatched_row():
-    df_t = _tmpl([
-        ["Zoe", "", "Nope"],
-    ])
-    df_c = _raw([
-        ["Someone", "Else"],
-    ])
+    m = mod.match_template_to_csv(DF_T_ZOE, DF_C_SOMEONE)
+    assert (m["_MATCH_TYPE"] == "unmatched").iloc[0]
+
+@pytest.mark.skipif(not (mod._HAS_RAPIDFUZZ or mod._HAS_NUMBA),
+                    reason="no fuzzy backend installed")
+def test_fuzzy_match_promotes_typo():
+    # One-character typo in the CSV last name: no exact key can hit, but
+    # the fuzzy fallback should promote the pair.
+    df_t = _tmpl([["Jonathan", "", "Smith"]])
+    df_c = _raw([["Smithe", "Jonathan"]])
     m = mod.match_template_to_csv(df_t, df_c)
+    assert (m["_MATCH_TYPE"] == "fuzzy").iloc[0]
+
+def test_mi_mismatch_stays_unmatched():
+    # Jane B's loose key equals Jane A's, but she was rejected on strict
+    # (MI) grounds — the fuzzy fallback must not hand her Jane A's pay row.
+    df_t = _tmpl([["Jane", "A", "Doe"], ["Jane", "B", "Doe"]])
+    df_c = _raw([["Doe", "Jane A"]])
+    m = mod.match_template_to_csv(df_t, df_c)
+    assert m["_MATCH_TYPE"].tolist() == ["strict", "unmatched"]
+
+def test_empty_last_name_column():
+    # Regression: an entirely empty last-name column (as in a malformed
+    # roster export) must not crash the suffix stripper.
+    df_t = _tmpl([["Jane", "", ""]])
+    m = mod.match_template_to_csv(df_t, DF_C_JANE)
     assert (m["_MATCH_TYPE"] == "unmatched").iloc[0]